@@ -10,12 +10,35 @@ Project Purpose:
 - Simple and clean architecture for easy understanding
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, g
+import functools
+import heapq
+import json
 import sqlite3
 import os
+import string
+import sys
+
+try:
+    import orjson  # optional: faster JSON encoding for the API
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 
+DATABASE = 'database.db'
+
+# Number of recommendations returned when the request does not pass ?k=
+TOP_K = 10
+
+# Punctuation removed from skill input; keeps , (separator) and characters
+# used in skill names such as node.js, problem-solving, c++, c#, ci/cd
+_STRIP_PUNCTUATION = str.maketrans('', '', ''.join(
+    c for c in string.punctuation if c not in ',-.+#/'))
+
+# In-process job catalog: database mtime, prebuilt jobs, skill vocabulary
+_JOBS_CACHE = None
+
 # ============================================================
 # FUNCTION 1: Get Database Connection
 # ============================================================
@@ -24,24 +47,40 @@ def get_db_connection():
     PURPOSE:
     - Safely connects to SQLite database
     - Sets up row factory for easy data access
+    - Reuses one connection for the whole request
     
     HOW IT WORKS:
-    - Opens connection to database.db
+    - Opens connection to database.db on first use in a request
     - Uses Row factory so we can access columns by name
-    - Returns connection object
+    - Enlarges SQLite's page cache for our read-heavy workload
+    - Stores the connection on flask.g and returns it
+    - close_db_connection() closes it when the request ends
     
     INTERVIEW ANSWER:
     "This function ensures safe database connection and allows
-    us to fetch job data efficiently using named columns."
+    us to fetch job data efficiently using named columns. Keeping
+    the connection on flask.g means each request opens it at most
+    once, and Flask closes it for us on teardown."
     """
-    conn = sqlite3.connect('database.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    if 'db' not in g:
+        g.db = sqlite3.connect(DATABASE)
+        g.db.row_factory = sqlite3.Row
+        g.db.execute("PRAGMA cache_size = -20000")
+    return g.db
+
+
+@app.teardown_appcontext
+def close_db_connection(exception):
+    """Close the request's database connection, if one was opened"""
+    db = g.pop('db', None)
+    if db is not None:
+        db.close()
 
 
 # ============================================================
 # FUNCTION 2: Clean and Validate User Skills
 # ============================================================
+@functools.lru_cache(maxsize=2048)
 def clean_user_skills(skills_input):
     """
     PURPOSE:
@@ -49,21 +88,23 @@ def clean_user_skills(skills_input):
     - Removes duplicates, extra spaces, converts to lowercase
     
     HOW IT WORKS:
+    - Removes stray punctuation and lowercases the whole input at once
     - Splits input by comma
     - Removes whitespace from each skill
-    - Converts to lowercase for matching
-    - Removes empty strings
+    - Removes empty strings and duplicates (keeping input order)
+    - Returns a tuple; results are cached per input string, so
+      resubmitting the same text skips the cleaning work
     
     INTERVIEW ANSWER:
     "This function validates and cleans user input to ensure
     accurate skill matching and prevent errors."
     """
-    if not skills_input or skills_input.strip() == "":
-        return []
+    if not skills_input:
+        return ()
     
-    skills = [skill.strip().lower() for skill in skills_input.split(',')]
-    skills = [skill for skill in skills if skill]  # Remove empty strings
-    return list(set(skills))  # Remove duplicates
+    skills_input = skills_input.translate(_STRIP_PUNCTUATION).lower()
+    skills = filter(None, map(str.strip, skills_input.split(',')))
+    return tuple(dict.fromkeys(skills))  # Remove duplicates
 
 
 # ============================================================
@@ -77,7 +118,8 @@ def get_job_data():
     
     HOW IT WORKS:
     - Connects to database
-    - Executes SELECT query to get all jobs
+    - Executes SELECT query for the role and skills columns only
+      (ORDER BY role is served by the idx_jobs_role index)
     - Returns list of all job records
     
     INTERVIEW ANSWER:
@@ -85,141 +127,281 @@ def get_job_data():
     which we then use for skill matching and recommendation."
     """
     conn = get_db_connection()
-    jobs = conn.execute("SELECT * FROM jobs ORDER BY role").fetchall()
-    conn.close()
+    jobs = conn.execute("SELECT role, skills FROM jobs ORDER BY role").fetchall()
     return jobs
 
 
 # ============================================================
-# FUNCTION 4: Calculate Skill Match Percentage
+# FUNCTION 4: Load Jobs Into Memory (Cached)
 # ============================================================
-def calculate_match(user_skills, job_skills_string):
+def load_jobs():
     """
     PURPOSE:
-    - Compares user skills with job requirements
-    - Calculates match percentage
+    - Keeps parsed job data in memory between requests
+    - Avoids opening the database on every recommendation
     
     HOW IT WORKS:
-    - Takes user skills list and job skills string
-    - Converts job skills to list
-    - Finds common skills using set intersection
-    - Calculates: (matched skills / total job skills) × 100
-    
-    FORMULA:
-    Match % = (Common Skills / Total Job Required Skills) × 100
+    - On first call, fetches jobs with get_job_data()
+    - Prebuilds each job's skill list and lowercase skill set
+      (skill names are interned, so each one is stored only once)
+    - Numbers every known skill (alphabetically) in a shared
+      vocabulary and stores each job's skills as a bitmask
+      (bit i set = job needs skill number i)
+    - Builds an inverted index from each skill to the jobs needing it
+    - Prebuilds each job's 0% recommendation (nothing matched)
+    - Reloads only when database.db is modified on disk
     
     INTERVIEW ANSWER:
-    "I use set operations to find common skills, then calculate
-    percentage match. This shows how many job requirements the
-    user already meets."
-    
-    EXAMPLE:
-    User: [python, sql]
-    Job: [python, sql, java]
-    Common: [python, sql] = 2
-    Match: (2/3) × 100 = 66%
+    "The jobs table rarely changes, so I load it once and cache it.
+    Requests read from memory, and the cache refreshes itself when
+    the database file changes."
     """
-    job_skills = [skill.strip().lower() for skill in job_skills_string.split(',')]
-    
-    # Find common skills using set intersection
-    user_skills_set = set(user_skills)
-    job_skills_set = set(job_skills)
-    matched_skills = user_skills_set & job_skills_set
-    
-    # Calculate percentage
-    if len(job_skills_set) == 0:
-        return 0
+    global _JOBS_CACHE
+    
+    mtime = os.path.getmtime(DATABASE)
+    if _JOBS_CACHE is not None and _JOBS_CACHE['mtime'] == mtime:
+        return _JOBS_CACHE
+    
+    jobs = []
+    for row in get_job_data():
+        skills_list = tuple(s.strip() for s in row['skills'].split(','))
+        jobs.append({
+            'role': row['role'],
+            'skills_set': frozenset(sys.intern(s.lower()) for s in skills_list),
+            'skills_list': skills_list,
+            'raw_skills': row['skills'],
+        })
+    
+    # Skill vocabulary: sorted names, so low-to-high bits give sorted names
+    skill_names = sorted(set().union(*(job['skills_set'] for job in jobs)))
+    skill_vocab = {name: i for i, name in enumerate(skill_names)}
+    for job in jobs:
+        job['skills_mask'] = skills_to_mask(job['skills_set'], skill_vocab)
+        job['skill_count'] = len(job['skills_set'])
+        # A 0% match always looks the same, so build it once here
+        job['no_match'] = {
+            'job_role': job['role'],
+            'match_percentage': 0,
+            'missing_skills': mask_to_skills(job['skills_mask'], skill_names),
+            'all_required_skills': job['skills_list'],
+            'user_has_skills': (),
+        }
     
-    match_percentage = int((len(matched_skills) / len(job_skills_set)) * 100)
-    return match_percentage
+    # Inverted index: skill -> positions of the jobs that need it
+    skill_jobs = {}
+    for position, job in enumerate(jobs):
+        for skill in job['skills_set']:
+            skill_jobs.setdefault(skill, []).append(position)
+    
+    _JOBS_CACHE = {
+        'mtime': mtime,
+        'jobs': jobs,
+        'skill_vocab': skill_vocab,
+        'skill_names': skill_names,
+        'skill_jobs': skill_jobs,
+    }
+    return _JOBS_CACHE
 
 
 # ============================================================
-# FUNCTION 5: Find Missing Skills
+# FUNCTION 5: Calculate Skill Match and Missing Skills
 # ============================================================
-def find_missing_skills(user_skills, job_skills_string):
+def calculate_match(user_mask, job_mask, job_skill_count):
     """
     PURPOSE:
-    - Identifies skills user needs to learn for specific job
-    - Helps freshers understand learning gaps
+    - Compares user skills with job requirements
+    - Calculates match percentage
+    - Identifies skills user needs to learn for the job
     
     HOW IT WORKS:
-    - Converts job skills to list
-    - Uses set difference to find missing skills
-    - Returns list of skills to learn
+    - Takes user and job skills as bitmasks over the skill vocabulary
+    - Common skills = user_mask & job_mask (one integer AND)
+    - Missing skills = job_mask & ~common skills
+    - Counts set bits to get the number of matched skills
+    - Calculates: (matched skills / total job skills) × 100
+    - Returns (match percentage, matched mask, missing mask)
+    
+    FORMULA:
+    Match % = (Common Skills / Total Job Required Skills) × 100
     
     INTERVIEW ANSWER:
-    "This function shows freshers exactly which skills they need
-    to develop to become suitable for a specific job role."
+    "Each skill is one bit, so finding common and missing skills is
+    a single AND on two integers instead of building new sets. I
+    count the common bits to get the match percentage."
     
     EXAMPLE:
-    User: [python, sql]
-    Job: [python, sql, java]
-    Missing: [java]  ← User must learn this
+    Vocabulary: java=bit 0, python=bit 1, sql=bit 2
+    User: {python, sql}        → 0b110
+    Job: {python, sql, java}   → 0b111
+    Common: 0b110 = 2 skills
+    Match: (2/3) × 100 = 66%
+    Missing: 0b001 = {java}  ← User must learn this
     """
-    job_skills = [skill.strip().lower() for skill in job_skills_string.split(',')]
+    # Find common skills with a bitwise AND
+    matched_mask = user_mask & job_mask
+    
+    # Missing skills = job skills without the matched ones
+    missing_mask = job_mask & ~matched_mask
     
-    user_skills_set = set(user_skills)
-    job_skills_set = set(job_skills)
+    # Calculate percentage
+    if job_skill_count == 0:
+        return 0, matched_mask, missing_mask
     
-    # Missing skills = job skills - user skills
-    missing_skills = job_skills_set - user_skills_set
-    return sorted(list(missing_skills))
+    matched_count = count_bits(matched_mask)
+    match_percentage = int((matched_count / job_skill_count) * 100)
+    return match_percentage, matched_mask, missing_mask
+
+
+if hasattr(int, 'bit_count'):  # Python 3.10+: popcount done in C
+    count_bits = int.bit_count
+else:
+    def count_bits(mask):
+        """Count the set bits (skills) in a bitmask"""
+        return bin(mask).count('1')
+
+
+def skills_to_mask(skills, skill_vocab):
+    """Convert skill names to a bitmask; unknown skills are ignored"""
+    mask = 0
+    for skill in skills:
+        if skill in skill_vocab:
+            mask |= 1 << skill_vocab[skill]
+    return mask
+
+
+def mask_to_skills(mask, skill_names):
+    """Convert a bitmask back to skill names, in alphabetical order"""
+    skills = []
+    while mask:
+        lowest_bit = mask & -mask
+        skills.append(skill_names[lowest_bit.bit_length() - 1])
+        mask ^= lowest_bit
+    return tuple(skills)
 
 
 # ============================================================
 # FUNCTION 6: Recommend Jobs (Main Logic)
 # ============================================================
-def recommend_jobs(user_skills):
+def recommend_jobs(user_skills, top_k=TOP_K):
     """
     PURPOSE:
     - Main recommendation engine
     - Ranks all jobs based on skill match
-    - Creates final recommendation list
+    - Creates final recommendation list of the best top_k jobs
     
     HOW IT WORKS:
-    1. Get all jobs from database
-    2. For each job:
-       - Calculate match percentage
-       - Find missing skills
-       - Store in recommendation dict
-    3. Sort by match percentage (highest first)
-    4. Return ranked list
+    1. Get all jobs from the in-memory cache
+    2. Convert user skills to a vocabulary bitmask once
+       (skills no job asks for can never match, so they are dropped)
+    3. Use the inverted index to find jobs sharing at least one
+       skill with the user, and calculate match percentage, matched
+       and missing skills for those jobs only
+    4. Keep the top_k highest matches with a heap (no full sort)
+    5. If fewer than top_k jobs matched, fill up with 0% jobs
+    6. Build recommendation dicts for the chosen jobs only
+    7. Return ranked list (as a tuple)
+    
+    Results are memoized per skill set: user_skills must be a
+    frozenset, and repeat queries are answered from memory until
+    database.db changes.
     
     INTERVIEW ANSWER:
     "This is the core function that processes all jobs, calculates
     match scores, and ranks them. It's the main decision-making
-    engine of the recommendation system."
+    engine of the recommendation system. Popular skill combinations
+    are cached, so repeat queries skip the matching work entirely."
     
     STEP-BY-STEP:
-    1. Fetch all jobs
+    1. Fetch all jobs (cached)
     2. Loop through each job
-    3. Calculate match for each job
-    4. Find missing skills for each job
-    5. Sort by match score
-    6. Return sorted list
+    3. Calculate match and missing skills for each job
+    4. Pick the top_k best matches
+    5. Return sorted list
     """
-    jobs = get_job_data()
-    recommendations = []
+    catalog = load_jobs()
+    return _rank_jobs(user_skills, catalog['mtime'], top_k)
+
+
+@functools.lru_cache(maxsize=4096)
+def _rank_jobs(user_skills, catalog_mtime, top_k):
+    """
+    Scores all jobs for one frozenset of user skills and returns the
+    top_k ranked recommendations. The catalog mtime is part of the
+    cache key, so results computed before a database change are never
+    served afterwards.
+    """
+    catalog = load_jobs()
+    skill_vocab = catalog['skill_vocab']
+    skill_names = catalog['skill_names']
     
-    for job in jobs:
-        match_percentage = calculate_match(user_skills, job['skills'])
-        missing_skills = find_missing_skills(user_skills, job['skills'])
-        
+    user_mask = skills_to_mask(user_skills, skill_vocab)
+    
+    jobs = catalog['jobs']
+    skill_jobs = catalog['skill_jobs']
+    
+    # Only jobs sharing at least one skill can score above 0%
+    candidates = sorted(set().union(
+        *(skill_jobs[s] for s in user_skills if s in skill_jobs)))
+    
+    scores = []
+    for position in candidates:
+        job = jobs[position]
+        scores.append((job,) + calculate_match(
+            user_mask, job['skills_mask'], job['skill_count']))
+    
+    # Keep the top_k by match percentage (highest first, ties keep role order)
+    best = heapq.nlargest(top_k, scores, key=lambda x: x[1])
+    
+    recommendations = []
+    for job, match_percentage, matched_mask, missing_mask in best:
         recommendation = {
             'job_role': job['role'],
             'match_percentage': match_percentage,
-            'missing_skills': missing_skills,
-            'all_required_skills': [s.strip() for s in job['skills'].split(',')],
-            'user_has_skills': [s for s in user_skills if s in 
-                               [x.strip().lower() for x in job['skills'].split(',')]]
+            'missing_skills': mask_to_skills(missing_mask, skill_names),
+            'all_required_skills': job['skills_list'],
+            'user_has_skills': mask_to_skills(matched_mask, skill_names)
         }
         
         recommendations.append(recommendation)
     
-    # Sort by match percentage (highest first)
-    recommendations.sort(key=lambda x: x['match_percentage'], reverse=True)
-    return recommendations
+    # Fill remaining slots with prebuilt 0% jobs in role order
+    if len(recommendations) < top_k:
+        candidate_set = set(candidates)
+        for position, job in enumerate(jobs):
+            if len(recommendations) == top_k:
+                break
+            if position not in candidate_set:
+                recommendations.append(job['no_match'])
+    
+    return tuple(recommendations)
+
+
+def recommend_jobs_json(user_skills, top_k=TOP_K):
+    """
+    Same as recommend_jobs(), but returns the API response body as
+    ready-to-send JSON bytes. Serialized bodies are cached too, so a
+    repeat API query skips both matching and JSON encoding.
+    """
+    catalog = load_jobs()
+    return _rank_jobs_json(user_skills, catalog['mtime'], top_k)
+
+
+@functools.lru_cache(maxsize=4096)
+def _rank_jobs_json(user_skills, catalog_mtime, top_k):
+    """Serialize _rank_jobs() output once per cache key (orjson if installed)"""
+    payload = {'recommendations': _rank_jobs(user_skills, catalog_mtime, top_k)}
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    body = json.dumps(payload, separators=(',', ':'), sort_keys=True)
+    return body.encode('utf-8')
+
+
+def get_top_k():
+    """Read the number of results from ?k=, falling back to TOP_K"""
+    try:
+        return max(1, int(request.args.get('k', TOP_K)))
+    except ValueError:
+        return TOP_K
 
 
 # ============================================================
@@ -268,20 +450,18 @@ def recommend():
     # Get user input from form
     skills_input = request.form.get('skills', '')
     
-    # Validate input
-    if not skills_input or skills_input.strip() == "":
-        return render_template('index.html', 
-                             error="Please enter at least one skill")
-    
-    # Clean user skills
+    # Clean and validate user skills
     user_skills = clean_user_skills(skills_input)
     
-    if len(user_skills) == 0:
-        return render_template('index.html', 
-                             error="Please enter valid skills")
+    if not user_skills:
+        if skills_input.strip():
+            error = "Please enter valid skills"
+        else:
+            error = "Please enter at least one skill"
+        return render_template('index.html', error=error)
     
     # Get recommendations
-    recommendations = recommend_jobs(user_skills)
+    recommendations = recommend_jobs(frozenset(user_skills), get_top_k())
     
     # Render results page
     return render_template('result.html', 
@@ -302,7 +482,8 @@ def api_recommend():
     
     HOW IT WORKS:
     - Same logic as /recommend route
-    - Returns JSON response
+    - Optional ?k=N query parameter limits the number of results
+    - Returns cached, pre-serialized JSON response
     - Useful for modern frontend frameworks
     
     INTERVIEW ANSWER:
@@ -312,11 +493,11 @@ def api_recommend():
     skills_input = request.json.get('skills', '')
     user_skills = clean_user_skills(skills_input)
     
-    if len(user_skills) == 0:
+    if not user_skills:
         return jsonify({'error': 'No valid skills provided'}), 400
     
-    recommendations = recommend_jobs(user_skills)
-    return jsonify({'recommendations': recommendations})
+    body = recommend_jobs_json(frozenset(user_skills), get_top_k())
+    return Response(body, mimetype='application/json')
 
 
 # ============================================================
@@ -336,6 +517,23 @@ def internal_error(e):
                          error="Server error. Please try again."), 500
 
 
+# ============================================================
+# STARTUP: Warm Job Cache
+# ============================================================
+def warm_job_cache():
+    """
+    Loads the job catalog when the app starts, so the first user
+    request does not pay for reading and parsing the database.
+    Skipped if the database has not been created yet.
+    """
+    if os.path.exists(DATABASE):
+        with app.app_context():
+            load_jobs()
+
+
+warm_job_cache()
+
+
 # ============================================================
 # MAIN APPLICATION ENTRY
 # ============================================================
@@ -349,5 +547,8 @@ if __name__ == '__main__':
         print("This will create and populate the database.")
         print("="*60 + "\n")
     
-    # Run Flask application
-    app.run(debug=True, host='127.0.0.1', port=5000)
+    # Run Flask development server (debug on unless FLASK_DEBUG=0).
+    # For production use a WSGI server instead, e.g.:
+    #   gunicorn -w 4 -k gthread --threads 8 app:app
+    debug = os.environ.get('FLASK_DEBUG', '1') == '1'
+    app.run(debug=debug, host='127.0.0.1', port=5000)
@@ -20,7 +20,7 @@ def setup_database():
     
     STEPS:
     1. Create or connect to database
-    2. Create jobs table
+    2. Create jobs table and role index
     3. Insert job roles with required skills
     4. Commit and close
     """
@@ -55,6 +55,9 @@ def setup_database():
         )
     """)
     
+    # Index on role so the app's ORDER BY role needs no sort step
+    cursor.execute("CREATE INDEX idx_jobs_role ON jobs(role)")
+    
     print("✓ Table created successfully")
     
     # Job data to insert